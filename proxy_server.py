@@ -10,6 +10,7 @@ Anggota:
 Fungsi proxy:
 - TCP proxy: laptop B konek ke port 8080 (proxy), lalu proxy forward ke web server port 8000
   Sekalian ada cache sederhana (biar kelihatan HIT / MISS)
+  Semua koneksi TCP dilayani 1 event loop asyncio (bukan 1 thread per client)
 - UDP proxy: laptop B kirim UDP ke port 9090 (proxy), lalu proxy terusin ke web server UDP port 9000
   Proxy balikin response ke client, sambil log RTT versi proxy
 
@@ -20,16 +21,24 @@ Port default:
 Cara run (Laptop A):
   python proxy_server.py --target-host 192.168.1.3
 
+  TCP proxy di beberapa proses (Linux/macOS, pakai SO_REUSEPORT):
+  python proxy_server.py --target-host 192.168.1.3 --processes 4
+
 Catatan penting:
 - target-host itu IP Laptop A yang dipakai web_server.py (biasanya IPv4 Wi-Fi)
 - Jangan lupa web_server.py harus sudah jalan dulu (HTTP 8000 dan UDP 9000)
 """
 
+import asyncio
 import socket
 import threading
 import logging
 import time
 import argparse
+import multiprocessing
+import signal
+import sys
+from collections import OrderedDict, deque
 
 HOST = "0.0.0.0"
 TCP_PORT = 8080          # proxy untuk HTTP
@@ -42,145 +51,454 @@ WEB_SERVER_UDP_PORT = 9000
 
 SOCKET_TIMEOUT = 8
 
+# Keep-alive koneksi client -> proxy: nunggu request berikutnya maks segini detik,
+# dan maks segini request per koneksi (sama kayak web_server.py)
+KEEPALIVE_TIMEOUT = 2
+KEEPALIVE_MAX = 100
+
+# Buffer socket UDP digedein (default kernel cuma ~208 KB) biar paket burst ga ke-drop
+UDP_SOCKET_BUFFER = 7 * 1024 * 1024
+
+# SO_REUSEPORT cuma ada di Linux/BSD/macOS (Windows ga ada)
+HAS_REUSEPORT = hasattr(socket, "SO_REUSEPORT")
+
+# Cuma di Linux kernel bagi rata koneksi ke beberapa socket SO_REUSEPORT di port yang sama.
+# Di macOS/BSD semua koneksi masuk ke 1 socket, jadi proses lainnya cuma nganggur.
+REUSEPORT_BALANCED = HAS_REUSEPORT and sys.platform.startswith("linux")
+
+# Maksimal paket UDP yang lagi nunggu echo dari web server (dihitung per paket, bukan per payload)
+UDP_PENDING_MAX = 4096
+
+# Paket UDP yang lagi nunggu echo dari web server
+# key: payload (web server echo payload apa adanya), value: antrean (client_addr, waktu kirim)
+# Antrean FIFO biar payload sama dari beberapa client (atau dikirim berkali-kali) ga saling timpa
+# Dipakai bareng thread forward dan thread balasan, jadi dijaga lock
+_UDP_PENDING: OrderedDict[bytes, deque[tuple[tuple[str, int], float]]] = OrderedDict()
+_UDP_PENDING_LOCK = threading.Lock()
+_UDP_PENDING_COUNT = 0
+
+# Batas buffer baca untuk request/response HTTP (limit StreamReader)
+RECV_BUFFER_SIZE = 64 * 1024
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [PROXY] %(levelname)s: %(message)s"
 )
 
-# Cache sederhana untuk response HTTP (key: request bytes, value: response bytes)
-HTTP_CACHE: dict[bytes, bytes] = {}
-CACHE_LOCK = threading.Lock()
+# Cache LRU untuk response HTTP
+# key: (method, path, host), value: response bytes
+# Dibatasi CACHE_MAX_ENTRIES, entry paling lama ga dipakai dibuang duluan
+# Cuma diakses dari event loop TCP proxy (1 thread), jadi ga perlu lock
+HTTP_CACHE: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+CACHE_MAX_ENTRIES = 256
+
+# Response yang lebih besar dari ini (atau tanpa Content-Length) ga di-cache,
+# tapi langsung diteruskan ke client per chunk tanpa nunggu response-nya lengkap
+CACHE_MAX_RESPONSE = 1024 * 1024
 
 
-def handle_tcp_client(client_conn: socket.socket, client_addr: tuple[str, int], target_host: str) -> None:
+def find_header(req: bytes, name: bytes) -> bytes | None:
     """
-    Handler koneksi TCP dari client (Laptop B).
-    Alur:
-    1) terima request dari client
-    2) cek cache
-    3) kalau MISS -> konek ke web server (target_host:8000), forward request, terima response
-    4) kirim response balik ke client
+    Cari nilai header di request (name huruf kecil, contoh b"host").
+    Cuma ngecek blok header (sampai baris kosong), pakai find() di bytes.
+    Return None kalau header-nya ga ada.
+    """
+    head_end = req.find(b"\r\n\r\n")
+    headers = req[:head_end + 2 if head_end != -1 else len(req)]
+    i = headers.lower().find(b"\r\n" + name + b":")
+    if i == -1:
+        return None
+    start = i + len(name) + 3
+    j = headers.find(b"\r\n", start)
+    return headers[start:j if j != -1 else len(headers)].strip()
+
+
+def with_connection(msg: bytes, value: bytes) -> bytes:
+    """
+    Ganti (atau tambah) header Connection di request/response jadi "Connection: <value>".
+    """
+    head_end = msg.find(b"\r\n\r\n")
+    if head_end == -1:
+        return msg
+    i = msg[:head_end + 2].lower().find(b"\r\nconnection:")
+    if i == -1:
+        return msg[:head_end] + b"\r\nConnection: " + value + msg[head_end:]
+    j = msg.find(b"\r\n", i + 2)
+    return msg[:i] + b"\r\nConnection: " + value + msg[j:]
+
+
+def with_connection_close(req: bytes) -> bytes:
+    """
+    Ganti (atau tambah) header Connection di request jadi "Connection: close".
+    Proxy cuma kirim 1 request per koneksi ke web server lalu baca response sampai EOF,
+    jadi web server harus nutup koneksinya (ga boleh keep-alive), dan response yang
+    di-cache juga bilang "Connection: close" (diganti lagi waktu dikirim ke client keep-alive).
+    """
+    return with_connection(req, b"close")
+
+
+def make_cache_key(req: bytes) -> tuple[str, str, str] | None:
+    """
+    Bikin key cache dari request: (method, path, host).
+    Header lain (User-Agent, Connection, dll) ga ikut, jadi GET yang sama tetap HIT.
+    Parsing langsung di bytes pakai find(), ga decode/split seluruh request,
+    jadi biaya per HIT ga tergantung panjang request.
+    Return None kalau request ga valid / bukan GET (ga di-cache).
+    """
+    line_end = req.find(b"\r\n")
+    if line_end == -1:
+        return None
+    parts = req[:line_end].split()
+    if len(parts) != 3 or parts[0].upper() != b"GET":
+        return None
+
+    host = find_header(req, b"host") or b""
+    return "GET", parts[1].decode(errors="ignore"), host.lower().decode(errors="ignore")
+
+
+def cache_get(key: tuple[str, str, str]) -> bytes | None:
+    """
+    Ambil response dari cache, sekalian tandai entry-nya baru dipakai.
+    """
+    resp = HTTP_CACHE.get(key)
+    if resp is not None:
+        HTTP_CACHE.move_to_end(key)
+    return resp
+
+
+def cache_put(key: tuple[str, str, str], resp: bytes) -> None:
+    """
+    Simpan response ke cache, buang entry paling lama kalau sudah penuh.
+    """
+    HTTP_CACHE[key] = resp
+    HTTP_CACHE.move_to_end(key)
+    while len(HTTP_CACHE) > CACHE_MAX_ENTRIES:
+        HTTP_CACHE.popitem(last=False)
+
+
+def wants_keep_alive(req: bytes) -> bool:
+    """
+    Cek client mau koneksinya dipakai lagi atau ga (sama kayak web_server.py):
+    HTTP/1.1 default keep-alive (kecuali "Connection: close"),
+    HTTP/1.0 default close (kecuali "Connection: keep-alive").
     """
-    client_conn.settimeout(SOCKET_TIMEOUT)
+    line_end = req.find(b"\r\n")
+    value = (find_header(req, b"connection") or b"").lower()
+    if req[:line_end].rstrip().endswith(b"HTTP/1.1"):
+        return b"close" not in value
+    return b"keep-alive" in value
 
+
+async def send_cached(writer: asyncio.StreamWriter, resp: bytes, keep_alive: bool) -> None:
+    """
+    Kirim response dari cache (disimpan versi "Connection: close").
+    Kalau koneksi client keep-alive, cuma header-nya yang ditulis ulang, body dikirim
+    lewat memoryview tanpa di-copy.
+    """
+    head_end = resp.find(b"\r\n\r\n")
+    if keep_alive and head_end != -1:
+        writer.write(with_connection(resp[:head_end + 4], b"keep-alive"))
+        writer.write(memoryview(resp)[head_end + 4:])
+    else:
+        writer.write(resp)
+    await writer.drain()
+
+
+async def forward_request(req: bytes, writer: asyncio.StreamWriter, target_host: str,
+                          client_addr, keep_alive: bool) -> bool:
+    """
+    Layani 1 request: cek cache, kalau MISS forward ke web server (target_host:8000)
+    lalu kirim response-nya balik ke client (response besar di-stream per chunk,
+    ga ditampung utuh di memori).
+    Return True kalau koneksi client masih bisa dipakai buat request berikutnya.
+    """
+    # Cek cache
+    key = make_cache_key(req)
+    cached = cache_get(key) if key is not None else None
+
+    if cached is not None:
+        await send_cached(writer, cached, keep_alive)
+        logging.info(f"[TCP] {client_addr} -> {target_host}:{WEB_SERVER_HTTP_PORT} cache=HIT bytes={len(cached)}")
+        return keep_alive
+
+    # Cache MISS: forward ke web server
+    up_reader, up_writer = await asyncio.wait_for(
+        asyncio.open_connection(target_host, WEB_SERVER_HTTP_PORT), SOCKET_TIMEOUT
+    )
     try:
-        req = b""
-        while True:
-            chunk = client_conn.recv(4096)
-            if not chunk:
-                break
-            req += chunk
-            # Request HTTP biasanya berhenti saat ketemu header end
-            if b"\r\n\r\n" in req:
-                break
-
-        if not req:
-            return
-
-        # Cek cache
-        with CACHE_LOCK:
-            cached = HTTP_CACHE.get(req)
-
-        if cached is not None:
-            client_conn.sendall(cached)
-            logging.info(f"[TCP] {client_addr} -> {target_host}:{WEB_SERVER_HTTP_PORT} cache=HIT bytes={len(cached)}")
-            return
-
-        # Cache MISS: forward ke web server
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(SOCKET_TIMEOUT)
-            s.connect((target_host, WEB_SERVER_HTTP_PORT))
-            s.sendall(req)
-
-            resp = b""
+        up_writer.write(with_connection_close(req))
+        await up_writer.drain()
+
+        try:
+            head = await asyncio.wait_for(up_reader.readuntil(b"\r\n\r\n"), SOCKET_TIMEOUT)
+        except asyncio.IncompleteReadError as e:
+            head = e.partial
+        resp_length = find_header(head, b"content-length")
+        try:
+            body_len = int(resp_length) if resp_length else -1
+        except ValueError:
+            body_len = -1
+        # Tanpa Content-Length akhir response ditandain EOF, jadi koneksi client harus ditutup
+        keep_alive = keep_alive and body_len >= 0
+
+        if 0 <= body_len and len(head) + body_len <= CACHE_MAX_RESPONSE:
+            # Response kecil: baca utuh (web server kirim "Connection: close", jadi sampai EOF)
+            resp = head + await asyncio.wait_for(up_reader.read(), SOCKET_TIMEOUT)
+        else:
+            # Response besar: terusin ke client per chunk begitu datang, ga di-cache
+            resp = None
+            writer.write(with_connection(head, b"keep-alive") if keep_alive else head)
+            sent = len(head)
             while True:
-                data = s.recv(4096)
-                if not data:
+                chunk = await asyncio.wait_for(up_reader.read(RECV_BUFFER_SIZE), SOCKET_TIMEOUT)
+                if not chunk:
                     break
-                resp += data
+                writer.write(chunk)
+                await writer.drain()
+                sent += len(chunk)
+    finally:
+        up_writer.close()
+
+    if resp is None:
+        await writer.drain()
+        logging.info(f"[TCP] {client_addr} -> {target_host}:{WEB_SERVER_HTTP_PORT} cache=MISS (stream) bytes={sent}")
+        return keep_alive
+
+    # Simpan ke cache
+    if key is not None:
+        cache_put(key, resp)
+
+    await send_cached(writer, resp, keep_alive)
+    logging.info(f"[TCP] {client_addr} -> {target_host}:{WEB_SERVER_HTTP_PORT} cache=MISS bytes={len(resp)}")
+    return keep_alive
+
 
-        # Simpan ke cache
-        with CACHE_LOCK:
-            HTTP_CACHE[req] = resp
+async def handle_tcp_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target_host: str) -> None:
+    """
+    Handler koneksi TCP dari client (Laptop B), jalan sebagai coroutine di event loop.
+    Alur:
+    1) terima request dari client (sampai header end)
+    2) layani lewat forward_request (cache HIT langsung dari cache, MISS ke web server)
+    3) kalau client keep-alive, balik ke 1) buat request berikutnya di koneksi yang sama
+       (maks KEEPALIVE_MAX request, nunggu request berikutnya maks KEEPALIVE_TIMEOUT detik)
 
-        client_conn.sendall(resp)
-        logging.info(f"[TCP] {client_addr} -> {target_host}:{WEB_SERVER_HTTP_PORT} cache=MISS bytes={len(resp)}")
+    Koneksi ke web server tetap 1 request per koneksi ("Connection: close"), yang dipakai
+    ulang cuma koneksi client -> proxy. Idle client cuma nahan 1 coroutine, bukan thread.
+    """
+    client_addr = writer.get_extra_info("peername")
+    logging.info(f"[TCP] New client {client_addr}")
+
+    try:
+        served = 0
+        while True:
+            # Request pertama boleh nunggu lebih lama, request lanjutan cuma KEEPALIVE_TIMEOUT
+            timeout = SOCKET_TIMEOUT if served == 0 else KEEPALIVE_TIMEOUT
+            complete = True
+            try:
+                req = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+            except asyncio.IncompleteReadError as e:
+                # Client nutup koneksi sebelum header end, forward apa adanya
+                req = e.partial
+                complete = False
+            except asyncio.TimeoutError:
+                if served == 0:
+                    raise
+                # Client keep-alive ga kirim request lagi, tutup biasa
+                return
+
+            if not req:
+                return
+
+            # GET biasanya ga punya body, jadi request sudah lengkap dari 1 kali baca di atas.
+            # Kalau ada Content-Length (misal POST), baca pas sisa body-nya.
+            content_length = find_header(req, b"content-length")
+            if content_length:
+                try:
+                    body_len = int(content_length)
+                except ValueError:
+                    body_len = 0
+                if body_len > 0:
+                    req += await asyncio.wait_for(reader.readexactly(body_len), SOCKET_TIMEOUT)
+
+            served += 1
+            keep_alive = complete and served < KEEPALIVE_MAX and wants_keep_alive(req)
+            if not await forward_request(req, writer, target_host, client_addr, keep_alive):
+                return
 
     except Exception as e:
-        logging.error(f"[TCP] Error forwarding to web server: {e}")
+        logging.error(f"[TCP] Error forwarding to web server: {e!r}")
     finally:
+        writer.close()
         try:
-            client_conn.close()
+            await writer.wait_closed()
         except Exception:
             pass
 
 
-def tcp_proxy_server(target_host: str) -> None:
+async def tcp_proxy_main(target_host: str, reuse_port: bool = False) -> None:
+    """
+    Jalankan server TCP proxy pakai asyncio (1 thread, selector/epoll).
+    Tiap koneksi client jadi 1 coroutine, bukan 1 thread.
+    asyncio otomatis set TCP_NODELAY di socket TCP-nya.
+
+    Kalau reuse_port (--processes > 1), beberapa proses proxy bind ke port yang sama pakai
+    SO_REUSEPORT dan kernel yang bagi-bagi koneksi baru ke tiap proses. Kalau 1 proses sengaja
+    ga di-set, biar proxy kedua di port yang sama gagal bind, bukan diam-diam kebagian koneksi.
+    """
+    server = await asyncio.start_server(
+        lambda r, w: handle_tcp_client(r, w, target_host),
+        HOST, TCP_PORT,
+        reuse_address=True,
+        reuse_port=reuse_port,
+        backlog=50,
+        limit=RECV_BUFFER_SIZE,
+    )
+    logging.info(f"[TCP] Proxy listening on {HOST}:{TCP_PORT} -> target {target_host}:{WEB_SERVER_HTTP_PORT}")
+
+    async with server:
+        await server.serve_forever()
+
+
+def tcp_proxy_server(target_host: str, reuse_port: bool = False) -> None:
     """
     Server TCP proxy.
     Nunggu koneksi dari client (Laptop B) di 0.0.0.0:8080.
+    Event loop asyncio jalan di thread ini (UDP proxy tetap di thread sendiri).
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        s.bind((HOST, TCP_PORT))
-        s.listen(50)
+    asyncio.run(tcp_proxy_main(target_host, reuse_port))
 
-        logging.info(f"[TCP] Proxy listening on {HOST}:{TCP_PORT} -> target {target_host}:{WEB_SERVER_HTTP_PORT}")
 
-        while True:
-            client_conn, client_addr = s.accept()
-            t = threading.Thread(target=handle_tcp_client, args=(client_conn, client_addr, target_host), daemon=True)
-            t.start()
-            logging.info(f"[TCP] New client {client_addr}")
+def udp_pending_add(data: bytes, client_addr: tuple[str, int]) -> list[tuple[bytes, tuple[str, int]]]:
+    """
+    Catat pengirim paket di antrean payload-nya. Kalau total paket yang nunggu lewat
+    UDP_PENDING_MAX, paket paling lama dibuang. Return paket yang dibuang (buat di-log).
+    """
+    global _UDP_PENDING_COUNT
+    lost = []
+    with _UDP_PENDING_LOCK:
+        queue = _UDP_PENDING.get(data)
+        if queue is None:
+            queue = _UDP_PENDING[data] = deque()
+        queue.append((client_addr, time.time()))
+        _UDP_PENDING_COUNT += 1
+        while _UDP_PENDING_COUNT > UDP_PENDING_MAX:
+            old_data, old_queue = next(iter(_UDP_PENDING.items()))
+            lost_addr, _ = old_queue.popleft()
+            if not old_queue:
+                del _UDP_PENDING[old_data]
+            _UDP_PENDING_COUNT -= 1
+            lost.append((old_data, lost_addr))
+    return lost
+
+
+def udp_pending_take(data: bytes, newest: bool = False) -> tuple[tuple[str, int], float] | None:
+    """
+    Ambil pengirim paling awal yang nunggu echo payload ini (FIFO). None kalau ga ada.
+    newest=True ambil yang paling baru dicatat (buat batalin paket yang gagal dikirim).
+    """
+    global _UDP_PENDING_COUNT
+    with _UDP_PENDING_LOCK:
+        queue = _UDP_PENDING.get(data)
+        if queue is None:
+            return None
+        entry = queue.pop() if newest else queue.popleft()
+        if not queue:
+            del _UDP_PENDING[data]
+        _UDP_PENDING_COUNT -= 1
+        return entry
+
+
+def udp_forward_loop(s: socket.socket, upstream: socket.socket, target: tuple[str, int]) -> None:
+    """
+    Loop arah client -> web server.
+    Catat pengirim tiap paket (udp_pending_add), lalu langsung forward tanpa nunggu balasan.
+    """
+    while True:
+        # Nunggu paket dari client. Kalau timeout, jangan crash, lanjut nunggu lagi.
+        try:
+            data, client_addr = s.recvfrom(65535)
+        except socket.timeout:
+            # Normal kalau belum ada client ngirim UDP
+            continue
+        except Exception as e:
+            logging.error(f"[UDP] recvfrom(client) error: {e}")
+            continue
+
+        # Dicatat dulu sebelum kirim, biar balasan yang cepet datang tetap ketemu pengirimnya
+        # Paket yang ga pernah dibalas dibuang paling awal
+        for lost, lost_addr in udp_pending_add(data, client_addr):
+            logging.warning(f"[UDP] No reply from web server for client {lost_addr} bytes={len(lost)}")
+
+        try:
+            upstream.sendto(data, target)
+        except Exception as e:
+            logging.error(f"[UDP] sendto(webserver) error: {e}")
+            udp_pending_take(data, newest=True)
+
+
+def udp_reply_loop(s: socket.socket, upstream: socket.socket) -> None:
+    """
+    Loop arah web server -> client.
+    Cocokkan echo dengan antrean pending (udp_pending_take) buat tahu client tujuannya,
+    kirim balik, log RTT.
+    """
+    while True:
+        try:
+            resp, server_addr = upstream.recvfrom(65535)
+        except socket.timeout:
+            continue
+        except Exception as e:
+            logging.error(f"[UDP] recvfrom(webserver) error: {e}")
+            continue
+        t1 = time.time()
+
+        entry = udp_pending_take(resp)
+        if entry is None:
+            logging.warning(f"[UDP] Unmatched reply from {server_addr} bytes={len(resp)}")
+            continue
+        client_addr, t0 = entry
+
+        try:
+            s.sendto(resp, client_addr)
+        except Exception as e:
+            logging.error(f"[UDP] sendto(client) error: {e}")
+            continue
+
+        rtt_ms = (t1 - t0) * 1000
+        logging.info(f"[UDP] {client_addr} -> {server_addr} bytes={len(resp)} RTT={rtt_ms:.2f} ms")
 
 
 def udp_proxy_server(target_host: str) -> None:
     """
     Server UDP proxy.
     - Terima paket dari client (Laptop B) di port 9090
-    - Forward ke web server UDP port 9000
+    - Forward ke web server UDP port 9000 lewat 1 socket upstream yang dipakai terus
+      (dibuka sekali di awal, bukan per paket)
     - Terima echo dari web server, balikin lagi ke client
 
+    Arah kirim dan arah terima jalan di 2 thread terpisah (pipelining), jadi paket
+    berikutnya ga perlu nunggu echo paket sebelumnya balik dulu.
+
     Log RTT versi proxy:
     - RTT dihitung dari waktu proxy kirim ke web server sampai proxy terima balasan.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+    target = (target_host, WEB_SERVER_UDP_PORT)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s, \
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as upstream:
+        for sock in (s, upstream):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_SOCKET_BUFFER)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, UDP_SOCKET_BUFFER)
+            sock.settimeout(SOCKET_TIMEOUT)
         s.bind((HOST, UDP_PORT))
-        s.settimeout(SOCKET_TIMEOUT)
+        # Upstream di-bind ke port acak dulu: thread balasan langsung recvfrom() sebelum ada paket
+        # yang dikirim, dan di Windows recvfrom di socket yang belum ke-bind langsung error (WSAEINVAL)
+        upstream.bind((HOST, 0))
         logging.info(f"[UDP] Proxy listening on {HOST}:{UDP_PORT} -> target {target_host}:{WEB_SERVER_UDP_PORT}")
 
-        while True:
-            # 1) Nunggu paket dari client. Kalau timeout, jangan crash, lanjut nunggu lagi.
-            try:
-                data, client_addr = s.recvfrom(65535)
-            except socket.timeout:
-                # Normal kalau belum ada client ngirim UDP
-                continue
-            except Exception as e:
-                logging.error(f"[UDP] recvfrom(client) error: {e}")
-                continue
-
-            # 2) Forward ke web server, hitung RTT versi proxy (proxy <-> web server)
-            t0 = time.time()
-            try:
-                s.sendto(data, (target_host, WEB_SERVER_UDP_PORT))
-            except Exception as e:
-                logging.error(f"[UDP] sendto(webserver) error: {e}")
-                continue
-
-            # 3) Terima balasan dari web server, lalu kirim balik ke client
-            try:
-                resp, server_addr = s.recvfrom(65535)
-                t1 = time.time()
-
-                s.sendto(resp, client_addr)
-
-                rtt_ms = (t1 - t0) * 1000
-                logging.info(f"[UDP] {client_addr} -> {server_addr} bytes={len(data)} RTT={rtt_ms:.2f} ms")
-            except socket.timeout:
-                logging.warning(f"[UDP] Timeout from web server for client {client_addr}")
-            except Exception as e:
-                logging.error(f"[UDP] recvfrom(webserver)/sendto(client) error: {e}")
+        t_reply = threading.Thread(target=udp_reply_loop, args=(s, upstream), daemon=True)
+        t_reply.start()
+        udp_forward_loop(s, upstream, target)
 
 
 def main() -> None:
@@ -199,15 +517,34 @@ def main() -> None:
         )
     )
     parser.add_argument("--target-host", default=WEB_SERVER_IP, help="IP web_server.py (Laptop A)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Jumlah proses TCP proxy (butuh SO_REUSEPORT yang load-balance, Linux; default 1).")
 
     args = parser.parse_args()
 
-    t_tcp = threading.Thread(target=tcp_proxy_server, args=(args.target_host,), daemon=True)
+    processes = args.processes
+    if processes > 1 and not REUSEPORT_BALANCED:
+        logging.warning("[PROXY] SO_REUSEPORT (load-balance) tidak tersedia di OS ini, TCP proxy jalan 1 proses saja")
+        processes = 1
+
+    # Proses tambahan cuma buat TCP proxy (cache-nya per proses). UDP proxy tetap 1 di proses utama.
+    # Dijalankan sebelum thread apa pun dibuat, biar fork-nya aman. Start method sengaja "fork"
+    # (bukan default, yang mulai Python 3.14 jadi forkserver di Linux) biar setup logging ikut kebawa.
+    # Context "fork" cuma diambil di sini (cabang ini cuma jalan di Linux), Windows ga punya fork.
+    reuse_port = processes > 1
+    if processes > 1:
+        mp = multiprocessing.get_context("fork")
+        for _ in range(processes - 1):
+            mp.Process(target=tcp_proxy_server, args=(args.target_host, reuse_port), daemon=True).start()
+        # SIGTERM ke proses utama -> exit normal, jadi proses daemon di atas ikut dimatikan
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    t_tcp = threading.Thread(target=tcp_proxy_server, args=(args.target_host, reuse_port), daemon=True)
     t_udp = threading.Thread(target=udp_proxy_server, args=(args.target_host,), daemon=True)
     t_tcp.start()
     t_udp.start()
 
-    logging.info(f"[PROXY] Ready. TCP:{TCP_PORT} UDP:{UDP_PORT}")
+    logging.info(f"[PROXY] Ready. TCP:{TCP_PORT} ({processes} proses) UDP:{UDP_PORT}")
 
     # Biar main thread ga selesai
     t_tcp.join()
@@ -4,14 +4,24 @@ Tugas Besar Jaringan Komputer
 Client (Laptop B) - Menu Version
 """
 
+import asyncio
 import socket
-import threading
 import argparse
+import array
 import time
 import csv
+import io
 import os
+import select
+import struct
 import webbrowser
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional, statistik QoS pakai Python biasa kalau ga ada
+    np = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,33 +34,120 @@ HTTP_PROXY_PORT = 8080
 UDP_SERVER_PORT = 9000
 UDP_PROXY_PORT = 9090
 
+# Buffer socket UDP digedein biar echo ga di-drop kernel waktu --interval kecil
+UDP_SOCKET_BUFFER = 7 * 1024 * 1024
+
+# Header biner paket UDP (--binary): seq uint32 + waktu kirim (ns) uint64, big-endian
+BINARY_HEADER = struct.Struct("!IQ")
+
+# Buffer file waktu nulis CSV hasil uji QoS
+CSV_WRITE_BUFFER = 1 << 20
+
+# Ukuran buffer recv_into untuk baca response HTTP
+RECV_BUFFER_SIZE = 64 * 1024
+
 
 # =========================
 # HTTP FUNCTION
 # =========================
-def http_request(host, port, path="/", save_as=None, open_browser=False):
-    start = time.time()
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+def open_http_connection(host, port):
+    # Socket + reader yang sama dipakai ulang buat beberapa request (keep-alive)
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.settimeout(8)
+    s.connect((host, port))
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return s, s.makefile("rb")
+
+
+def close_http_connection(conn):
+    s, reader = conn
+    try:
+        reader.close()
+        s.close()
+    except OSError:
+        pass
 
-        s.settimeout(8)
-        s.connect((host, port))
-        req = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n"
-        s.sendall(req.encode())
 
-        response = b""
+def read_http_response(reader):
+    # Baca 1 response dari koneksi persistent pakai Content-Length / chunked.
+    # Return (header_bytes, body, keep_alive)
+    head = []
+    while True:
+        line = reader.readline(65537)
+        if not line:
+            raise ConnectionError("Koneksi ditutup server sebelum response selesai")
+        head.append(line)
+        if line in (b"\r\n", b"\n"):
+            break
+
+    headers = {}
+    for line in head[1:-1]:
+        name, _, value = line.partition(b":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = headers.get(b"connection", b"").lower() != b"close"
+
+    if headers.get(b"transfer-encoding", b"").lower() == b"chunked":
+        chunks = []
         while True:
-            data = s.recv(4096)
-            if not data:
+            size = int(reader.readline().split(b";", 1)[0], 16)
+            if size == 0:
+                # Buang trailer sampai baris kosong
+                while reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
                 break
-            response += data
+            chunks.append(reader.read(size))
+            reader.readline()
+        body = b"".join(chunks)
+    elif b"content-length" in headers:
+        body = reader.read(int(headers[b"content-length"]))
+    else:
+        # Tanpa panjang body: server nutup koneksi buat nandain akhir response
+        body = reader.read()
+        keep_alive = False
+
+    return b"".join(head), body, keep_alive
+
+
+def http_request(host, port, path="/", save_as=None, open_browser=False, conn=None):
+    # Kalau conn (hasil open_http_connection) dikasih, request dikirim lewat koneksi itu
+    # pakai keep-alive. Return True kalau koneksinya masih bisa dipakai lagi.
+    start = time.time()
+    if conn is None:
+        keep_alive = False
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(8)
+            s.connect((host, port))
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            req = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n"
+            s.sendall(req.encode())
+
+            # recv_into ke 1 buffer 64 KB yang dipakai ulang, hasilnya ditulis ke BytesIO
+            # (bytes += bytes itu O(N^2), recv(4096) juga bikin object baru tiap chunk)
+            buf = bytearray(RECV_BUFFER_SIZE)
+            mv = memoryview(buf)
+            out = io.BytesIO()
+            while True:
+                n = s.recv_into(mv)
+                if not n:
+                    break
+                out.write(mv[:n])
+            response = out.getvalue()
 
-    duration = time.time() - start
-    logging.info(f"Received {len(response)} bytes in {duration:.4f} s")
+        try:
+            _, body = response.split(b"\r\n\r\n", 1)
+        except ValueError:
+            body = b""
+        received = len(response)
+    else:
+        s, reader = conn
+        req = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n"
+        s.sendall(req.encode())
+        header, body, keep_alive = read_http_response(reader)
+        received = len(header) + len(body)
 
-    try:
-        _, body = response.split(b"\r\n\r\n", 1)
-    except ValueError:
-        body = b""
+    duration = time.time() - start
+    logging.info(f"Received {received} bytes in {duration:.4f} s")
 
     if save_as:
         with open(save_as, "wb") as f:
@@ -59,55 +156,278 @@ def http_request(host, port, path="/", save_as=None, open_browser=False):
         if open_browser:
             webbrowser.open(f"file://{os.path.abspath(save_as)}")
 
+    return keep_alive
 
-def http_multi_client(host, port, path="/", num_clients=5):
-    def worker(idx):
+
+def http_worker(host, port, path="/", num_requests_per_worker=1):
+    # Satu worker kirim beberapa GET lewat 1 koneksi TCP, jadi handshake cuma sekali.
+    # Kalau server minta "Connection: close", buka koneksi baru buat request berikutnya.
+    if num_requests_per_worker <= 1:
         http_request(host, port, path)
-        logging.info(f"Thread-{idx} selesai")
+        return
 
-    threads = []
-    for i in range(num_clients):
-        t = threading.Thread(target=worker, args=(i + 1,), daemon=True)
-        t.start()
-        threads.append(t)
+    conn = None
+    try:
+        for _ in range(num_requests_per_worker):
+            if conn is None:
+                conn = open_http_connection(host, port)
+            if not http_request(host, port, path, conn=conn):
+                close_http_connection(conn)
+                conn = None
+    finally:
+        if conn is not None:
+            close_http_connection(conn)
+
+
+def http_multi_client(host, port, path="/", num_clients=5, workers=None, requests_per_worker=1):
+    # Pakai thread pool, jadi thread dipakai ulang (ga bikin/buang thread per request)
+    # Minimal 1 worker: ThreadPoolExecutor(max_workers=0) langsung ValueError (misal --clients 0)
+    if workers is None:
+        workers = max(1, min(num_clients, 32))
+    workers = max(1, workers)
+
+    def worker(idx):
+        http_worker(host, port, path, requests_per_worker)
+        return idx
 
-    for t in threads:
-        t.join()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-client") as pool:
+        futures = [pool.submit(worker, i + 1) for i in range(num_clients)]
+        for fut in as_completed(futures):
+            try:
+                idx = fut.result()
+                logging.info(f"Thread-{idx} selesai")
+            except Exception as e:
+                logging.error(f"HTTP request gagal: {e}")
+
+
+async def http_fetch_async(host, port, path="/"):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=8)
+    try:
+        req = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n"
+        writer.write(req.encode())
+        await writer.drain()
+        # read() tanpa argumen = baca sampai EOF (server nutup koneksi)
+        response = await asyncio.wait_for(reader.read(), timeout=8)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return len(response)
+
+
+def http_multi_client_async(host, port, path="/", num_clients=5):
+    # Semua request jalan barengan di 1 event loop (1 thread), bukan 1 thread per client
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(
+            *(http_fetch_async(host, port, path) for _ in range(num_clients)),
+            return_exceptions=True
+        )
+        duration = loop.time() - start
+
+        ok = 0
+        for idx, result in enumerate(results, 1):
+            if isinstance(result, Exception):
+                logging.error(f"Task-{idx} gagal: {result}")
+            else:
+                ok += 1
+                logging.info(f"Task-{idx} received {result} bytes")
+        logging.info(f"{ok}/{num_clients} request selesai dalam {duration:.4f} s")
+
+    asyncio.run(run())
 
 
 # =========================
 # UDP FUNCTION
 # =========================
-def udp_qos_test(host, port, csv_file):
+def udp_qos_test(host, port, csv_file, num_packets=50, packet_size=100, interval=0.05, binary=False,
+                 stream_csv=False):
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(1)
+    stream_file = None
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_SOCKET_BUFFER)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, UDP_SOCKET_BUFFER)
+        # Kirim dan terima dipisah: socket non-blocking, nunggu echo pakai select sampai jadwal
+        # kirim berikutnya. Paket yang echo-nya belum datang dianggap hilang kalau lewat recv_timeout
+        # setelah paket terakhir dikirim.
+        recv_timeout = max(1.0, interval * 2)
+        sock.setblocking(False)
+        addr = (host, port)
+
+        # Buffer payload dialokasi sekali. Tiap paket cuma header "seq;ts;" di depan yang ditimpa,
+        # sisanya padding "x" sampai packet_size. ";" di akhir header misahin header dari sisa
+        # digit header sebelumnya yang mungkin lebih panjang.
+        # Mode binary: header fixed 12 byte (BINARY_HEADER) di offset 0, ga perlu encode/decode teks.
+        if binary:
+            packet_size = max(packet_size, BINARY_HEADER.size)
+        buf = bytearray(b"x" * packet_size)
+        mv = memoryview(buf)
+
+        # Waktu pakai integer nanodetik: perf_counter_ns buat RTT, monotonic_ns buat pacing.
+        # send_times diindeks langsung pakai seq (1..num_packets), 0 = ga ada paket yang ditunggu.
+        # Hasil RTT juga disimpan di array (seq dan rtt_ns terpisah), bukan list tuple.
+        send_times = array.array("q", bytes(8 * (num_packets + 1)))
+        rtt_seqs = array.array("I")
+        rtt_values = array.array("q")
+
+        # Mode stream: tiap RTT langsung ditulis ke CSV dan statistik dihitung jalan (one-pass),
+        # jadi memori tetap O(1) walaupun --num besar banget
+        stream_writer = None
+        if csv_file and stream_csv:
+            stream_file = open(csv_file, "w", newline="", buffering=CSV_WRITE_BUFFER)
+            stream_writer = csv.writer(stream_file)
+            stream_writer.writerow(["seq", "rtt_ms"])
+        received = 0
+        mean_ms = 0.0
+        prev_ms = None
+        sum_abs_diff = 0.0
+        outstanding = 0
+
+        def record_echo(data, recv_ns):
+            nonlocal received, mean_ms, prev_ms, sum_abs_diff, outstanding
+            # RTT dihitung dari seq di echo, jadi echo yang telat tetap dipasangin ke paketnya
+            try:
+                if binary:
+                    resp_seq, _ = BINARY_HEADER.unpack_from(data)
+                else:
+                    # Langsung dari bytes, ga perlu decode ke str dulu
+                    resp_seq = int(data[:data.index(b";")])
+            except (ValueError, struct.error):
+                logging.warning("Balasan tidak dikenal")
+                return
+            # Entry langsung di-nol-kan begitu echo-nya datang (echo dobel juga ga kehitung 2x)
+            resp_send_ns = send_times[resp_seq] if 0 < resp_seq <= num_packets else 0
+            if not resp_send_ns:
+                return
+            send_times[resp_seq] = 0
+            outstanding -= 1
+            rtt_ns = recv_ns - resp_send_ns
+            logging.info(f"Seq {resp_seq} RTT {rtt_ns / 1e6:.2f} ms")
+            if stream_writer is None:
+                rtt_seqs.append(resp_seq)
+                rtt_values.append(rtt_ns)
+            else:
+                rtt_ms = rtt_ns / 1e6
+                stream_writer.writerow([resp_seq, rtt_ms])
+                received += 1
+                mean_ms += (rtt_ms - mean_ms) / received
+                if prev_ms is not None:
+                    sum_abs_diff += abs(rtt_ms - prev_ms)
+                prev_ms = rtt_ms
+
+        def drain_until(deadline_ns, stop_when_done=False):
+            # Tunggu socket readable sampai deadline, lalu ambil semua echo yang sudah antre
+            # sekaligus (recvfrom non-blocking sampai kosong) sebelum balik ke select lagi
+            while not (stop_when_done and outstanding == 0):
+                timeout = max(0.0, (deadline_ns - time.monotonic_ns()) / 1e9)
+                readable, _, _ = select.select([sock], [], [], timeout)
+                if not readable:
+                    return
+                while True:
+                    try:
+                        data, _ = sock.recvfrom(65535)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except ConnectionResetError:
+                        # Windows: ICMP port unreachable dari paket sebelumnya, abaikan
+                        continue
+                    record_echo(data, time.perf_counter_ns())
+
+        def send_packet(payload):
+            # Socket non-blocking: kalau send buffer penuh (SO_SNDBUF bisa dibatasi kernel, misal
+            # wmem_max), tunggu sampai bisa ditulis lagi maks recv_timeout, lewat itu dianggap hilang
+            while True:
+                try:
+                    sock.sendto(payload, addr)
+                    return True
+                except (BlockingIOError, InterruptedError):
+                    _, writable, _ = select.select([], [sock], [], recv_timeout)
+                    if not writable:
+                        return False
+
+        interval_ns = int(interval * 1e9)
+        next_send = time.monotonic_ns()
+
+        for seq in range(1, num_packets + 1):
+            send_ns = time.perf_counter_ns()
+            if binary:
+                BINARY_HEADER.pack_into(buf, 0, seq, send_ns)
+                payload = buf
+            else:
+                header = f"{seq};{send_ns};".encode()
+                n = len(header)
+                if n <= packet_size:
+                    mv[:n] = header
+                    payload = buf
+                else:
+                    payload = header
+            if send_packet(payload):
+                send_times[seq] = send_ns
+                outstanding += 1
+            else:
+                logging.warning(f"Seq {seq} gagal dikirim (send buffer penuh)")
+
+            # Jadwal kirim tetap tiap interval; selama nunggu jadwal berikutnya, echo yang masuk
+            # langsung diproses (ga nunggu echo per paket lagi)
+            next_send += interval_ns
+            drain_until(next_send)
+
+        # Sisa echo yang belum datang ditunggu maksimal recv_timeout, berhenti lebih cepat kalau
+        # semua sudah masuk
+        drain_until(time.monotonic_ns() + int(recv_timeout * 1e9), stop_when_done=True)
+    finally:
+        # Socket dan file CSV tetap ditutup walaupun tes-nya gagal di tengah jalan
+        sock.close()
+        if stream_file is not None:
+            stream_file.close()
+
+    if outstanding:
+        for seq in range(1, num_packets + 1):
+            if send_times[seq]:
+                logging.warning(f"Seq {seq} timeout")
+
+    if stream_writer is not None:
+        avg = mean_ms
+        jitter = sum_abs_diff / (received - 1) if received >= 2 else 0.0
+    else:
+        rtt_ms = array.array("d", (rtt_ns / 1e6 for rtt_ns in rtt_values))
+        received = len(rtt_values)
+        avg, jitter = qos_stats(rtt_ms)
+        if csv_file:
+            save_rtt_csv(csv_file, rtt_seqs, rtt_ms)
+
+    loss = (num_packets - received) / num_packets * 100 if num_packets else 0.0
+    logging.info(f"Diterima {received}/{num_packets} (loss {loss:.1f}%) "
+                 f"avg latency {avg:.2f} ms, jitter {jitter:.2f} ms")
+    if csv_file:
+        logging.info(f"CSV disimpan: {csv_file}")
 
-    rtts = []
-    start = time.time()
 
-    for seq in range(1, 51):
-        payload = f"{seq};{time.time()}".encode()
-        sock.sendto(payload, (host, port))
-        try:
-            data, _ = sock.recvfrom(4096)
-            recv_time = time.time()
-            rtt = recv_time - start
-            rtts.append((seq, rtt))
-            logging.info(f"Seq {seq} RTT {rtt*1000:.2f} ms")
-        except socket.timeout:
-            logging.warning(f"Seq {seq} timeout")
+def qos_stats(rtt_ms):
+    # Return (avg_latency_ms, jitter_ms). Jitter = rata-rata |selisih RTT paket berurutan|
+    if np is not None:
+        arr = np.asarray(rtt_ms, dtype=np.float64)
+        avg = float(arr.mean()) if arr.size else 0.0
+        jitter = float(np.abs(np.diff(arr)).mean()) if arr.size >= 2 else 0.0
+        return avg, jitter
 
-        time.sleep(0.05)
+    avg = sum(rtt_ms) / len(rtt_ms) if rtt_ms else 0.0
+    diffs = [abs(b - a) for a, b in zip(rtt_ms, rtt_ms[1:])]
+    jitter = sum(diffs) / len(diffs) if diffs else 0.0
+    return avg, jitter
 
-    sock.close()
 
-    if csv_file:
-        with open(csv_file, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["seq", "rtt_ms"])
-            for seq, rtt in rtts:
-                writer.writerow([seq, rtt * 1000])
-        logging.info(f"CSV disimpan: {csv_file}")
+def save_rtt_csv(csv_file, seqs, rtt_ms):
+    if np is not None:
+        np.savetxt(csv_file, np.column_stack([seqs, rtt_ms]), delimiter=",",
+                   header="seq,rtt_ms", comments="", fmt=["%d", "%.6f"])
+        return
+
+    # Buffer file 1 MB + writerows, jadi semua baris ditulis dalam beberapa write() besar
+    with open(csv_file, "w", newline="", buffering=CSV_WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(["seq", "rtt_ms"])
+        writer.writerows(zip(seqs, rtt_ms))
 
 
 # =========================
@@ -123,7 +443,30 @@ def show_menu():
     print("0. Keluar")
 
 
+def build_parser():
+    parser = argparse.ArgumentParser(description="Client (Laptop B) - Menu Version")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="IP Laptop A (web server / proxy).")
+    parser.add_argument("--clients", type=int, default=5, help="Jumlah client di HTTP Multi (default 5).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah worker thread untuk HTTP Multi (default: min(jumlah client, 32)).")
+    parser.add_argument("--requests-per-worker", type=int, default=1,
+                        help="Jumlah GET per client di HTTP Multi. >1 pakai 1 koneksi keep-alive per client.")
+    parser.add_argument("--num", type=int, default=50, help="Jumlah paket UDP per uji QoS (default 50).")
+    parser.add_argument("--size", type=int, default=100, help="Ukuran payload UDP dalam byte (default 100).")
+    parser.add_argument("--interval", type=float, default=0.05, help="Jeda antar paket UDP dalam detik (default 0.05).")
+    parser.add_argument("--binary", action="store_true",
+                        help="Header paket UDP biner (seq + timestamp, 12 byte) alih-alih teks \"seq;ts;\".")
+    parser.add_argument("--stream-csv", action="store_true",
+                        help="Tulis CSV RTT langsung selama uji UDP (memori tetap kecil untuk --num besar).")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="HTTP Multi pakai asyncio (1 thread, event loop) alih-alih thread pool.")
+    return parser
+
+
 def main():
+    args = build_parser().parse_args()
+    host = args.host.strip()
+
     while True:
         show_menu()
         choice = input("Pilih menu: ").strip()
@@ -135,16 +478,20 @@ def main():
             sub = input("Pilih: ")
 
             port = HTTP_SERVER_PORT if sub == "1" else HTTP_PROXY_PORT
-            http_request(DEFAULT_HOST, port)
+            http_request(host, port)
 
         elif choice == "2":
-            print("HTTP Multi (5 client via proxy)")
-            http_multi_client(DEFAULT_HOST, HTTP_PROXY_PORT)
+            print(f"HTTP Multi ({args.clients} client via proxy)")
+            if args.use_async:
+                http_multi_client_async(host, HTTP_PROXY_PORT, num_clients=args.clients)
+            else:
+                http_multi_client(host, HTTP_PROXY_PORT, num_clients=args.clients, workers=args.workers,
+                                  requests_per_worker=args.requests_per_worker)
 
         elif choice == "3":
             print("Browser Mode")
             http_request(
-                DEFAULT_HOST,
+                host,
                 HTTP_PROXY_PORT,
                 save_as="hasil.html",
                 open_browser=True
@@ -152,11 +499,13 @@ def main():
 
         elif choice == "4":
             print("UDP Direct")
-            udp_qos_test(DEFAULT_HOST, UDP_SERVER_PORT, "direct.csv")
+            udp_qos_test(host, UDP_SERVER_PORT, "direct.csv", args.num, args.size, args.interval,
+                         args.binary, args.stream_csv)
 
         elif choice == "5":
             print("UDP via Proxy")
-            udp_qos_test(DEFAULT_HOST, UDP_PROXY_PORT, "via_proxy.csv")
+            udp_qos_test(host, UDP_PROXY_PORT, "via_proxy.csv", args.num, args.size, args.interval,
+                         args.binary, args.stream_csv)
 
         elif choice == "0":
             print("Keluar...")
@@ -5,7 +5,8 @@ web_server.py
 Web Server sederhana untuk Tugas Besar Jaringan Komputer:
 1) HTTP file server (TCP) pada port 8000
    - mode single (1 client per waktu)
-   - mode threaded (pakai thread pool)
+   - mode threaded (beberapa worker thread, masing-masing accept() sendiri)
+   - mode async (asyncio, 1 thread event loop)
 2) UDP Echo server pada port 9000
    - balikin payload yang diterima (buat uji QoS/RTT dari client)
 
@@ -16,19 +17,33 @@ Cara run (Laptop A):
 - HTTP threaded:
   python web_server.py --mode threaded --host 0.0.0.0 --http-port 8000 --www www --workers 5
 
+- HTTP async:
+  python web_server.py --mode async --host 0.0.0.0 --http-port 8000 --www www
+  (UDP echo ikut dilayani event loop yang sama, ga pakai thread sendiri)
+
+- HTTP multi proses (Linux, tiap proses jalan mode yang dipilih):
+  python web_server.py --mode threaded --host 0.0.0.0 --http-port 8000 --www www --processes 4
+
 Catatan:
 - Kalau kalian akses dari Laptop B, host yang dipakai di client adalah IP Laptop A (contoh: 192.168.1.3)
 - File HTML taruh di folder www (default: www/index.html)
 """
 
+import asyncio
 import os
 import socket
 import threading
 import argparse
 import logging
-import mimetypes
+import mmap
+import multiprocessing
+import pathlib
+import select
+import signal
+import stat
+import sys
 import time
-from queue import Queue
+from collections import OrderedDict
 
 logging.basicConfig(
     level=logging.INFO,
@@ -39,21 +54,107 @@ logging.basicConfig(
 # Bagian A: util untuk HTTP
 # =========================================================
 
-def read_http_request(conn: socket.socket) -> bytes:
+# os.sendfile ga ada di Windows. Di sana file besar di-mmap sekali dan
+# mapping-nya dipakai bareng semua worker thread (ga di-read ulang per request).
+HAS_SENDFILE = hasattr(os, "sendfile")
+
+# Flag os.open file yang diminta client: O_NOFOLLOW (symlink ga diikutin) cuma ada di POSIX,
+# O_BINARY cuma ada di Windows. O_NONBLOCK biar open FIFO ga nunggu writer selamanya
+# (sampai fstat + S_ISREG di bawah yang jawab 404); buat file biasa ga ada efeknya.
+OPEN_FLAGS = (os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+              | getattr(os, "O_NONBLOCK", 0))
+MMAP_MIN_SIZE = 64 * 1024
+
+# file_path -> (mtime_ns, size, mmap)
+_MMAP_CACHE: dict[str, tuple[int, int, mmap.mmap]] = {}
+_MMAP_LOCK = threading.Lock()
+
+# Cache LRU response utuh (header + body) untuk file kecil, jadi request yang sering
+# (misal index.html) cukup 1 lookup dict + 1 sendmsg, tanpa open/read/format header.
+# key: (file_path, mtime_ns, size) -> (header "close", header "keep-alive", body bytes)
+RESPONSE_CACHE_MAX_FILE = 256 * 1024
+RESPONSE_CACHE_MAX_ENTRIES = 32
+RESPONSE_CACHE_MAX_BYTES = 4 * 1024 * 1024
+_RESPONSE_CACHE: OrderedDict[tuple[str, int, int], tuple[bytes, bytes, bytes]] = OrderedDict()
+_RESPONSE_CACHE_BYTES = 0
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# Keep-alive: koneksi ditutup kalau ga ada request baru dalam KEEPALIVE_TIMEOUT detik
+# atau sudah melayani KEEPALIVE_MAX request
+REQUEST_TIMEOUT = 5.0
+KEEPALIVE_TIMEOUT = 2
+KEEPALIVE_MAX = 100
+
+# Mode threaded: worker yang lagi nunggu request lanjutan keep-alive ngecek tiap segini detik
+# ada koneksi baru yang antre padahal ga ada worker yang lagi accept(). Kalau ada, koneksi
+# idle-nya dilepas (lihat wait_keep_alive). _FREE_WORKERS = jumlah worker yang lagi di accept().
+KEEPALIVE_POLL = 0.05
+_FREE_WORKERS = 0
+_FREE_WORKERS_LOCK = threading.Lock()
+
+# socket.sendmsg ga ada di Windows, di sana buffer dikirim satu-satu pakai sendall
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+# Statistik ringkas, dicatat per thread (threading.local) biar hot path ga rebutan lock.
+# Tiap thread daftar dict counter-nya sekali ke _STATS_ALL, lalu stats_reporter()
+# yang jumlahin dan log ringkasannya tiap STATS_INTERVAL detik.
+STATS_INTERVAL = 5.0
+_STATS_LOCAL = threading.local()
+_STATS_ALL: list[dict[str, int]] = []
+_STATS_LOCK = threading.Lock()
+
+
+def read_http_request(conn: socket.socket, pending: bytes = b"", timeout: float = REQUEST_TIMEOUT) -> tuple[bytes, bytes]:
     """
     Baca request HTTP dari client sampai header selesai (\r\n\r\n).
-    Return: raw bytes request.
+    Return: (raw bytes request, sisa byte setelah header end).
+    Sisa byte itu awal request berikutnya kalau client kirim beberapa request sekaligus
+    (pipelining), dioper lagi lewat pending di panggilan berikutnya.
+    Pakai 1 buffer 64 KB + recv_into (ga ada bytes += bytes yang copy ulang tiap chunk).
     """
-    conn.settimeout(5.0)
-    data = b""
-    while b"\r\n\r\n" not in data:
-        chunk = conn.recv(4096)
-        if not chunk:
-            break
-        data += chunk
-        if len(data) > 64 * 1024:
+    end = pending.find(b"\r\n\r\n")
+    if end != -1:
+        return pending[:end + 4], pending[end + 4:]
+
+    conn.settimeout(timeout)
+    buf = bytearray(64 * 1024)
+    view = memoryview(buf)
+    pos = len(pending)
+    buf[:pos] = pending
+    lowat_reset = False
+    while pos < len(buf):
+        if pos and not lowat_reset:
+            # Request kepotong: sisanya bisa lebih pendek dari SO_RCVLOWAT dan poll() ga bakal
+            # bangun, jadi balikin low-water mark ke 1 byte (jarang kejadian, request biasanya 1 segmen)
+            set_rcvlowat(conn, 1)
+            lowat_reset = True
+        n = conn.recv_into(view[pos:])
+        if not n:
             break
-    return data
+        # Header end bisa kepotong di batas chunk, jadi cari mulai 3 byte sebelum chunk baru
+        search_from = max(0, pos - 3)
+        pos += n
+        end = buf.find(b"\r\n\r\n", search_from, pos)
+        if end != -1:
+            return bytes(view[:end + 4]), bytes(view[end + 4:pos])
+    return bytes(view[:pos]), b""
+
+
+def wants_keep_alive(raw: bytes, version: str) -> bool:
+    """
+    Cek client mau koneksinya dipakai lagi atau ga, dari header Connection.
+    HTTP/1.1 default keep-alive (kecuali "Connection: close"),
+    HTTP/1.0 default close (kecuali "Connection: keep-alive").
+    """
+    head = raw.lower()
+    i = head.find(b"\r\nconnection:")
+    value = b""
+    if i != -1:
+        j = head.find(b"\r\n", i + 2)
+        value = head[i + 13:j if j != -1 else len(head)]
+    if version == "HTTP/1.1":
+        return b"close" not in value
+    return b"keep-alive" in value
 
 
 def parse_http_request(raw: bytes):
@@ -61,16 +162,18 @@ def parse_http_request(raw: bytes):
     Parsing minimal request HTTP.
     Return: (method, path, version)
     Jika gagal, return (None, None, None)
+    Parsing langsung di bytes (ga decode seluruh header), yang di-decode cuma
+    3 bagian request line. Path di-decode ASCII karena dipakai buat cari file.
+    Request line diambil pakai find + slice, jadi sisa header ga ikut di-copy.
     """
     try:
-        text = raw.decode(errors="ignore")
-        lines = text.split("\r\n")
-        request_line = lines[0].strip()
+        line_end = raw.find(b"\r\n")
+        request_line = (raw[:line_end] if line_end != -1 else raw).strip()
         parts = request_line.split()
         if len(parts) != 3:
             return None, None, None
         method, path, version = parts
-        return method.upper(), path, version
+        return method.decode("ascii").upper(), path.decode("ascii", "replace"), version.decode("ascii")
     except Exception:
         return None, None, None
 
@@ -102,94 +205,435 @@ def safe_join_www(www_root: str, url_path: str) -> str:
     return joined_abs
 
 
-def build_http_response(status_code: int, body: bytes, content_type: str = "text/html; charset=utf-8") -> bytes:
+# Content-Type per ekstensi file
+_CTYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".htm": "text/html; charset=utf-8",
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".json": "application/json",
+    ".txt": "text/plain; charset=utf-8",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".ico": "image/x-icon",
+    ".pdf": "application/pdf",
+}
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _build_header_template(status_code: int, content_type: str, keep_alive: bool = False) -> bytes:
     """
-    Bikin response HTTP sederhana.
+    Bagian header yang tetap untuk (status, content type, keep-alive); tinggal ditambah angka Content-Length.
     """
-    reason = {
-        200: "OK",
-        400: "Bad Request",
-        403: "Forbidden",
-        404: "Not Found",
-        405: "Method Not Allowed",
-        500: "Internal Server Error",
-    }.get(status_code, "OK")
+    reason = HTTP_REASONS.get(status_code, "OK")
+    if keep_alive:
+        connection = f"Connection: keep-alive\r\nKeep-Alive: timeout={KEEPALIVE_TIMEOUT}, max={KEEPALIVE_MAX}\r\n"
+    else:
+        connection = "Connection: close\r\n"
+    return (
+        f"HTTP/1.1 {status_code} {reason}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"{connection}"
+        "Content-Length: "
+    ).encode()
+
+
+# Template header dihitung sekali waktu import untuk kombinasi yang umum:
+# semua status dengan text/html (halaman error) + 200 dengan semua content type,
+# masing-masing versi close dan keep-alive
+_TEMPLATES: dict[tuple[int, str, bool], bytes] = {
+    (status, ctype, keep_alive): _build_header_template(status, ctype, keep_alive)
+    for status, ctype in (
+        [(code, "text/html; charset=utf-8") for code in HTTP_REASONS]
+        + [(200, ctype) for ctype in set(_CTYPES.values()) | {"application/octet-stream"}]
+    )
+    for keep_alive in (False, True)
+}
 
-    headers = [
-        f"HTTP/1.1 {status_code} {reason}",
-        f"Content-Length: {len(body)}",
-        f"Content-Type: {content_type}",
-        "Connection: close",
-        "\r\n"
-    ]
-    header_bytes = "\r\n".join(headers).encode()
-    return header_bytes + body
+
+def build_http_headers(status_code: int, content_length: int, content_type: str = "text/html; charset=utf-8",
+                       keep_alive: bool = False) -> bytes:
+    """
+    Bikin status line + header HTTP saja (tanpa body).
+    Dipakai kalau body-nya dikirim terpisah (misal lewat sendfile).
+    Per request cuma format angka Content-Length, sisanya dari _TEMPLATES.
+    """
+    template = _TEMPLATES.get((status_code, content_type, keep_alive))
+    if template is None:
+        template = _build_header_template(status_code, content_type, keep_alive)
+    return template + str(content_length).encode() + b"\r\n\r\n"
+
+
+def build_http_response(status_code: int, body: bytes, content_type: str = "text/html; charset=utf-8",
+                        keep_alive: bool = False) -> tuple[bytes, bytes]:
+    """
+    Bikin response HTTP sederhana: (header, body).
+    Header dan body sengaja ga digabung (header + body = copy seluruh body),
+    nanti dikirim bareng dalam 1 syscall pakai send_parts.
+    """
+    return build_http_headers(status_code, len(body), content_type, keep_alive), body
+
+
+def get_file_mmap(file_path: str, fd: int, st: os.stat_result) -> mmap.mmap:
+    """
+    Ambil mmap read-only untuk file, dari cache kalau file-nya belum berubah (mtime + size).
+    Entry lama cuma dilepas dari cache, ga di-close, karena bisa jadi masih dipakai
+    thread lain yang lagi ngirim; mmap ke-close sendiri kalau sudah ga ada yang pakai.
+    """
+    with _MMAP_LOCK:
+        entry = _MMAP_CACHE.get(file_path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        _MMAP_CACHE[file_path] = (st.st_mtime_ns, st.st_size, mm)
+        return mm
+
+
+def response_cache_get(key: tuple[str, int, int]) -> tuple[bytes, bytes, bytes] | None:
+    """
+    Ambil response dari cache (sekalian tandai baru dipakai). None kalau MISS.
+    """
+    with _RESPONSE_CACHE_LOCK:
+        response = _RESPONSE_CACHE.get(key)
+        if response is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+        return response
+
+
+def response_cache_put(key: tuple[str, int, int], response: tuple[bytes, bytes, bytes]) -> None:
+    """
+    Simpan response ke cache. Entry paling lama dibuang kalau jumlah entry
+    atau total byte-nya lewat batas.
+    """
+    global _RESPONSE_CACHE_BYTES
+    with _RESPONSE_CACHE_LOCK:
+        if key in _RESPONSE_CACHE:
+            return
+        _RESPONSE_CACHE[key] = response
+        _RESPONSE_CACHE_BYTES += sum(map(len, response))
+        while (len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX_ENTRIES
+               or _RESPONSE_CACHE_BYTES > RESPONSE_CACHE_MAX_BYTES):
+            _, old = _RESPONSE_CACHE.popitem(last=False)
+            _RESPONSE_CACHE_BYTES -= sum(map(len, old))
 
 
 def guess_content_type(file_path: str) -> str:
     """
-    Tebak Content-Type berdasarkan ekstensi file.
+    Tebak Content-Type berdasarkan ekstensi file (lookup dict, bukan mimetypes
+    yang pertama kali dipanggil harus baca /etc/mime.types dulu).
+    """
+    return _CTYPES.get(os.path.splitext(file_path)[1].lower(), "application/octet-stream")
+
+
+def error_response(status_code: int, keep_alive: bool = False) -> tuple[bytes, bytes]:
+    """
+    Response HTML sederhana untuk status error (400/403/404/405/500).
+    """
+    body = f"<h1>{status_code} {HTTP_REASONS[status_code]}</h1>".encode()
+    return build_http_response(status_code, body, keep_alive=keep_alive)
+
+
+def prepare_response(raw: bytes, www_root: str, allow_keep_alive: bool = True):
+    """
+    Proses 1 request (tanpa I/O socket), dipakai bareng handler blocking dan asyncio.
+    Return: (status, path, file_path, size, parts, body_file, keep_alive)
+    - parts: buffer (bytes / mmap) yang dikirim berurutan
+    - body_file: file yang sudah dibuka kalau setelah parts, body dikirim pakai sendfile
+      (yang manggil wajib close), None kalau body sudah ada di parts
+    - keep_alive: True kalau koneksi dipakai lagi buat request berikutnya
+    """
+    method, path, version = parse_http_request(raw)
+
+    # Request rusak / bukan GET (bisa ada body yang ga dibaca): selalu tutup koneksi
+    if not method or not path:
+        return 400, path, "", 0, error_response(400), None, False
+
+    if method != "GET":
+        return 405, path, "", 0, error_response(405), None, False
+
+    keep_alive = allow_keep_alive and wants_keep_alive(raw, version)
+
+    file_path = safe_join_www(www_root, path)
+    if file_path == "":
+        return 403, path, "", 0, error_response(403, keep_alive), None, keep_alive
+
+    # 1x os.open + fstat (bukan exists + isfile + stat + open), dan file yang dicek pasti file
+    # yang sama dengan yang dikirim. Folder / symlink / ga ada -> 404
+    try:
+        f = open(os.open(file_path, OPEN_FLAGS), "rb", buffering=0)
+    except OSError:
+        return 404, path, file_path, 0, error_response(404, keep_alive), None, keep_alive
+
+    try:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            f.close()
+            return 404, path, file_path, 0, error_response(404, keep_alive), None, keep_alive
+
+        ctype = guess_content_type(file_path)
+
+        if st.st_size <= RESPONSE_CACHE_MAX_FILE:
+            # File kecil: kirim response utuh dari cache (MISS -> baca file sekali, simpan)
+            key = (file_path, st.st_mtime_ns, st.st_size)
+            response = response_cache_get(key)
+            if response is None:
+                body = f.read()
+                response = (build_http_headers(200, len(body), ctype),
+                            build_http_headers(200, len(body), ctype, keep_alive=True),
+                            body)
+                response_cache_put(key, response)
+            f.close()
+            return (200, path, file_path, st.st_size, (response[1] if keep_alive else response[0], response[2]),
+                    None, keep_alive)
+
+        if not HAS_SENDFILE and st.st_size >= MMAP_MIN_SIZE:
+            # Tanpa os.sendfile: kirim langsung dari mmap (buffer protocol, ga di-copy ke bytes)
+            mm = get_file_mmap(file_path, f.fileno(), st)
+            f.close()
+            headers = build_http_headers(200, len(mm), ctype, keep_alive)
+            return 200, path, file_path, len(mm), (headers, mm), None, keep_alive
+    except BaseException:
+        f.close()
+        raise
+
+    # Body dikirim pakai sendfile dari file yang sudah dibuka di atas: isi file langsung dari
+    # page cache ke socket di kernel, ga perlu dibaca ke memori Python dulu. (socket.sendfile
+    # otomatis fallback ke read+send kalau os.sendfile ga ada, misal di Windows)
+    headers = build_http_headers(200, st.st_size, ctype, keep_alive)
+    return 200, path, file_path, st.st_size, (headers,), f, keep_alive
+
+
+def send_parts(conn: socket.socket, parts) -> None:
+    """
+    Kirim beberapa buffer (header, body) sekaligus pakai sendmsg (scatter-gather / writev),
+    jadi ga perlu digabung dulu ke 1 bytes baru. sendmsg bisa kekirim sebagian,
+    sisanya dikirim ulang mulai dari offset yang belum terkirim.
     """
-    ctype, _ = mimetypes.guess_type(file_path)
-    if not ctype:
-        ctype = "application/octet-stream"
-    return ctype
+    if not HAS_SENDMSG:
+        for part in parts:
+            conn.sendall(part)
+        return
+
+    views = [memoryview(part) for part in parts if len(part)]
+    while views:
+        sent = conn.sendmsg(views)
+        while views and sent >= len(views[0]):
+            sent -= len(views.pop(0))
+        if sent:
+            views[0] = views[0][sent:]
 
 
-def handle_http_client(conn: socket.socket, addr, www_root: str):
+def thread_stats() -> dict[str, int]:
+    """
+    Counter statistik milik thread ini (dibuat + didaftarkan waktu pertama dipakai).
+    """
+    stats = getattr(_STATS_LOCAL, "stats", None)
+    if stats is None:
+        stats = {"http_requests": 0, "http_bytes": 0, "udp_datagrams": 0}
+        _STATS_LOCAL.stats = stats
+        with _STATS_LOCK:
+            _STATS_ALL.append(stats)
+    return stats
+
+
+def stats_reporter(interval: float = STATS_INTERVAL):
+    """
+    Thread background: tiap interval detik log 1 baris ringkasan (jumlah request, byte, datagram)
+    sebagai ganti log INFO per request / per datagram.
+    """
+    last = {"http_requests": 0, "http_bytes": 0, "udp_datagrams": 0}
+    while True:
+        time.sleep(interval)
+        with _STATS_LOCK:
+            all_stats = list(_STATS_ALL)
+        total = {key: sum(stats[key] for stats in all_stats) for key in last}
+        delta = {key: total[key] - last[key] for key in last}
+        last = total
+        if any(delta.values()):
+            logging.info(f"[STATS pid={os.getpid()}] {interval:.0f}s terakhir: HTTP {delta['http_requests']} request "
+                         f"({delta['http_requests'] / interval:.1f} req/s, {delta['http_bytes']} bytes), "
+                         f"UDP {delta['udp_datagrams']} datagram")
+
+
+def log_response(addr, path: str, file_path: str, size: int, start: float):
+    """
+    Log detail per request, cuma kalau level DEBUG aktif (--verbose).
+    Dicek dulu biar f-string-nya ga dibikin percuma tiap request.
+    """
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    elapsed = (time.time() - start) * 1000.0
+    logging.debug(f"[HTTP] Request from {addr[0]}:{addr[1]} -> GET {path}")
+    logging.debug(f"[HTTP] Sent response to {addr[0]}:{addr[1]} file={os.path.basename(file_path)} size={size} bytes time={elapsed:.2f} ms")
+
+
+def wait_keep_alive(conn: socket.socket, listen_sock: socket.socket) -> bool:
+    """
+    Tunggu request lanjutan di koneksi keep-alive (mode threaded), maks KEEPALIVE_TIMEOUT detik.
+    Return False kalau koneksinya mending dilepas: idle kelamaan, atau ada koneksi baru yang
+    antre di listen_sock dan semua worker lagi nahan koneksi (ga ada yang accept()).
+
+    Trade-off: client keep-alive yang idle tetap nahan 1 worker thread selama ga ada yang
+    antre. Begitu worker habis, koneksi idle itu yang ditutup duluan (client-nya harus
+    konek ulang buat request berikutnya), biar client baru ga nunggu sampai KEEPALIVE_TIMEOUT.
+    """
+    deadline = time.monotonic() + KEEPALIVE_TIMEOUT
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if select.select([conn], [], [], min(KEEPALIVE_POLL, remaining))[0]:
+            return True
+        if _FREE_WORKERS == 0 and select.select([listen_sock], [], [], 0)[0]:
+            return False
+
+
+def handle_http_client(conn: socket.socket, addr, www_root: str, keep_alive: bool = True,
+                       listen_sock: socket.socket | None = None):
     """
     Handler 1 koneksi TCP:
     - baca request
     - hanya support GET
     - ambil file dari www_root
     - kirim response
+    - kalau keep-alive, ulang lagi buat request berikutnya di koneksi yang sama
+      sampai client nutup / idle KEEPALIVE_TIMEOUT detik / sudah KEEPALIVE_MAX request
+    - listen_sock (mode threaded): koneksi keep-alive yang idle dilepas kalau ada client
+      baru yang antre dan ga ada worker lain yang nganggur (lihat wait_keep_alive)
     """
-    start = time.time()
+    pending = b""
+    served = 0
     try:
-        raw = read_http_request(conn)
-        method, path, _version = parse_http_request(raw)
+        while True:
+            if served and listen_sock is not None and not pending and not wait_keep_alive(conn, listen_sock):
+                break  # idle keep-alive dilepas, tutup tanpa response
+            start = time.time()
+            try:
+                raw, pending = read_http_request(conn, pending, KEEPALIVE_TIMEOUT if served else REQUEST_TIMEOUT)
+            except socket.timeout:
+                if served:
+                    break  # idle keep-alive habis, tutup tanpa response
+                raise
+            if not raw and served:
+                break  # client nutup koneksi setelah request sebelumnya
 
-        if not method or not path:
-            body = b"<h1>400 Bad Request</h1>"
-            conn.sendall(build_http_response(400, body))
-            return
+            served += 1
+            # Header ga lengkap (kepotong EOF / lebih dari 64 KB): sisa header-nya masih di socket,
+            # jadi koneksinya ditutup, sama kayak LimitOverrunError di handler async
+            status, path, file_path, size, parts, body_file, keep_open = prepare_response(
+                raw, www_root,
+                allow_keep_alive=keep_alive and served < KEEPALIVE_MAX and raw.endswith(b"\r\n\r\n")
+            )
 
-        if method != "GET":
-            body = b"<h1>405 Method Not Allowed</h1>"
-            conn.sendall(build_http_response(405, body))
-            return
+            try:
+                send_parts(conn, parts)
+                if body_file is not None:
+                    conn.sendfile(body_file, 0, size)
+            finally:
+                if body_file is not None:
+                    body_file.close()
 
-        file_path = safe_join_www(www_root, path)
-        if file_path == "":
-            body = b"<h1>403 Forbidden</h1>"
-            conn.sendall(build_http_response(403, body))
-            return
+            stats = thread_stats()
+            stats["http_requests"] += 1
+            stats["http_bytes"] += size
+            if status == 200:
+                log_response(addr, path, file_path, size, start)
 
-        if not os.path.exists(file_path) or not os.path.isfile(file_path):
-            body = b"<h1>404 Not Found</h1>"
-            conn.sendall(build_http_response(404, body))
-            return
+            if not keep_open:
+                break
 
-        with open(file_path, "rb") as f:
-            body = f.read()
+    except Exception as e:
+        logging.error(f"[HTTP] Error handling client {addr}: {e}")
+        try:
+            send_parts(conn, error_response(500))
+        except Exception:
+            pass
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
 
-        ctype = guess_content_type(file_path)
-        conn.sendall(build_http_response(200, body, ctype))
 
-        elapsed = (time.time() - start) * 1000.0
-        logging.info(f"[HTTP] Request from {addr[0]}:{addr[1]} -> GET {path}")
-        logging.info(f"[HTTP] Sent response to {addr[0]}:{addr[1]} file={os.path.basename(file_path)} size={len(body)} bytes time={elapsed:.2f} ms")
+async def handle_http_client_async(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, www_root: str):
+    """
+    Versi asyncio dari handle_http_client (1 coroutine per koneksi):
+    - baca request pakai readuntil(header end)
+    - proses request sama persis (prepare_response)
+    - body file besar dikirim pakai loop.sendfile (os.sendfile kalau bisa)
+    - keep-alive sama seperti handle_http_client (sisa request pipelining tetap di StreamReader)
+    """
+    addr = writer.get_extra_info("peername")
+    tune_client_socket(writer.get_extra_info("socket"))
+    served = 0
+    try:
+        while True:
+            start = time.time()
+            allow_keep_alive = served + 1 < KEEPALIVE_MAX
+            try:
+                raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"),
+                                             KEEPALIVE_TIMEOUT if served else REQUEST_TIMEOUT)
+            except asyncio.TimeoutError:
+                if served:
+                    break  # idle keep-alive habis, tutup tanpa response
+                raise
+            except asyncio.IncompleteReadError as e:
+                raw = e.partial
+            except asyncio.LimitOverrunError:
+                # Header lebih dari batas (64 KB), sama kayak read_http_request: parse seadanya,
+                # tapi koneksinya ditutup karena sisa header-nya masih di stream
+                raw = await reader.read(64 * 1024)
+                allow_keep_alive = False
+            if not raw and served:
+                break  # client nutup koneksi setelah request sebelumnya
+
+            served += 1
+            status, path, file_path, size, parts, body_file, keep_open = prepare_response(
+                raw, www_root, allow_keep_alive=allow_keep_alive
+            )
+
+            try:
+                writer.writelines(parts)
+                if body_file is not None:
+                    await writer.drain()
+                    await asyncio.get_running_loop().sendfile(writer.transport, body_file, 0, size)
+                await writer.drain()
+            finally:
+                if body_file is not None:
+                    body_file.close()
+
+            stats = thread_stats()
+            stats["http_requests"] += 1
+            stats["http_bytes"] += size
+            if status == 200:
+                log_response(addr, path, file_path, size, start)
+
+            if not keep_open:
+                break
 
     except Exception as e:
-        logging.error(f"[HTTP] Error handling client {addr}: {e}")
+        logging.error(f"[HTTP] Error handling client {addr}: {e!r}")
         try:
-            body = b"<h1>500 Internal Server Error</h1>"
-            conn.sendall(build_http_response(500, body))
+            writer.writelines(error_response(500))
+            await writer.drain()
         except Exception:
             pass
     finally:
+        writer.close()
         try:
-            conn.close()
+            await writer.wait_closed()
         except Exception:
             pass
 
@@ -198,106 +642,315 @@ def handle_http_client(conn: socket.socket, addr, www_root: str):
 # Bagian B: HTTP server (single dan threaded)
 # =========================================================
 
-def http_server_single(host: str, port: int, www_root: str):
+# Batas tunggu (detik) request pertama sebelum koneksi di-accept, lihat enable_defer_accept()
+DEFER_ACCEPT_SECONDS = 5
+
+# Send buffer socket client, biar response sampai ratusan KB bisa masuk kernel sekaligus
+CLIENT_SNDBUF = 256 * 1024
+
+# SO_RCVLOWAT socket client: recv pertama baru bangun kalau sudah ada minimal segini byte
+# (request terpendek "GET / HTTP/1.0\r\n\r\n" = 18 byte), jadi potongan segmen kecil ga bikin
+# worker bangun percuma. Lihat set_rcvlowat() dan read_http_request().
+CLIENT_RCVLOWAT = 16
+
+# Antrian koneksi yang belum di-accept. 50 gampang penuh kalau banyak client connect bareng.
+LISTEN_BACKLOG = 1024
+
+# Di Linux, beberapa socket SO_REUSEPORT di port yang sama dibagi rata koneksinya oleh kernel.
+# Di macOS/BSD SO_REUSEPORT ada tapi ga load-balance (semua koneksi masuk ke 1 socket),
+# jadi di sana --processes ga dipakai (lihat main()).
+REUSEPORT_BALANCED = hasattr(socket, "SO_REUSEPORT") and sys.platform.startswith("linux")
+
+
+def tune_listen_socket(s: socket.socket, reuse_port: bool = False):
     """
-    Mode single:
-    - accept() satu-satu
-    - handle langsung di main thread
+    Opsi socket listen: SO_REUSEADDR (gampang restart), SO_REUSEPORT cuma kalau reuse_port
+    (dipakai --processes > 1). Kalau 1 proses sengaja ga di-set, biar instance kedua di port
+    yang sama gagal bind, bukan diam-diam kebagian setengah koneksi.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        # Reuse port supaya gampang restart
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port and hasattr(socket, "SO_REUSEPORT"):
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
 
-        s.bind((host, port))
-        s.listen(50)
 
-        logging.info(f"[HTTP] Single server listening on {host}:{port} (www={www_root})")
+def enable_defer_accept(s: socket.socket):
+    """
+    TCP_DEFER_ACCEPT (Linux): accept() baru balik setelah client betul-betul ngirim data,
+    jadi recv pertama di worker langsung dapat request (ga ada wakeup/blocking tambahan),
+    dan koneksi kosong ga pernah makan worker.
+    """
+    if hasattr(socket, "TCP_DEFER_ACCEPT"):
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_DEFER_ACCEPT, DEFER_ACCEPT_SECONDS)
 
-        while True:
-            conn, addr = s.accept()
-            logging.info(f"[HTTP] Connection from {addr}")
-            handle_http_client(conn, addr, www_root)
+
+def tune_client_socket(conn: socket.socket):
+    """
+    Opsi socket hasil accept():
+    - TCP_NODELAY: matikan Nagle, response kecil langsung dikirim (ga ketahan ~40 ms nunggu ACK)
+    - SO_SNDBUF lebih besar
+    """
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, CLIENT_SNDBUF)
+
+
+def open_listen_socket(host: str, port: int, reuse_port: bool = False) -> socket.socket:
+    """
+    Bikin socket listen TCP yang sudah di-tune (reuse, backlog besar, defer accept).
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        # Reuse addr supaya gampang restart (reuse port cuma kalau beberapa proses di 1 port)
+        tune_listen_socket(s, reuse_port)
+        s.bind((host, port))
+        s.listen(LISTEN_BACKLOG)
+        enable_defer_accept(s)
+    except Exception:
+        s.close()
+        raise
+    return s
 
 
-def http_worker_loop(job_queue: Queue, www_root: str):
+def http_accept_loop(s: socket.socket, www_root: str, keep_alive: bool = True):
     """
-    Loop worker thread:
-    - ambil job dari queue
-    - job isinya (conn, addr)
+    Loop accept() lalu handle langsung di thread ini.
+    Jumlah worker yang lagi di accept() dicatat di _FREE_WORKERS (dipakai wait_keep_alive).
     """
+    global _FREE_WORKERS
     while True:
-        conn, addr = job_queue.get()
+        with _FREE_WORKERS_LOCK:
+            _FREE_WORKERS += 1
         try:
-            handle_http_client(conn, addr, www_root)
+            conn, addr = s.accept()
         finally:
-            job_queue.task_done()
+            with _FREE_WORKERS_LOCK:
+                _FREE_WORKERS -= 1
+        tune_client_socket(conn)
+        set_rcvlowat(conn, CLIENT_RCVLOWAT)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"[HTTP] Connection from {addr}")
+        handle_http_client(conn, addr, www_root, keep_alive, listen_sock=s)
+
+
+def set_rcvlowat(conn: socket.socket, nbytes: int):
+    """
+    Set SO_RCVLOWAT kalau OS-nya support (Windows ga ada).
+    """
+    if hasattr(socket, "SO_RCVLOWAT"):
+        try:
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVLOWAT, nbytes)
+        except OSError:
+            pass
 
 
-def http_server_threaded(host: str, port: int, www_root: str, workers: int = 5):
+def http_server_single(host: str, port: int, www_root: str, reuse_port: bool = False):
+    """
+    Mode single:
+    - accept() satu-satu
+    - handle langsung di main thread
+    - tanpa keep-alive, biar 1 client yang idle ga nahan client lain
+    """
+    with open_listen_socket(host, port, reuse_port) as s:
+        logging.info(f"[HTTP] Single server listening on {host}:{port} (www={www_root})")
+        http_accept_loop(s, www_root, keep_alive=False)
+
+
+def http_server_threaded(host: str, port: int, www_root: str, workers: int = 5, reuse_port: bool = False):
     """
     Mode threaded:
-    - main thread hanya accept() lalu masukin (conn, addr) ke queue
-    - worker threads yang proses request
+    - tiap worker thread accept() sendiri lalu langsung handle koneksinya
+      (ga ada thread acceptor + queue yang jadi titik antre)
+    - semua worker accept() di 1 socket listen yang sama. Sengaja bukan 1 socket SO_REUSEPORT
+      per worker: kernel bagi koneksi ke socket tanpa lihat worker-nya lagi sibuk atau ga,
+      jadi koneksi baru bisa nunggu di belakang worker yang lagi nahan koneksi keep-alive
+      sementara worker lain nganggur. SO_REUSEPORT cuma dipakai antar proses (--processes).
+    - koneksi keep-alive nahan 1 worker selama nunggu request lanjutan. Kalau semua worker
+      lagi nahan koneksi dan ada client baru antre, koneksi yang idle dilepas (wait_keep_alive).
     """
-    job_queue = Queue()
+    workers = max(1, workers)
+    # Socket di-bind dulu di main thread, jadi kalau port kepakai (dan bukan --processes)
+    # error-nya langsung keliatan
+    s = open_listen_socket(host, port, reuse_port)
+
+    logging.info(f"[HTTP] Threaded server listening on {host}:{port} with {workers} workers (www={www_root})")
 
-    # Start thread pool
-    for i in range(workers):
-        t = threading.Thread(target=http_worker_loop, args=(job_queue, www_root), daemon=True)
+    # Main thread juga jadi salah satu worker
+    for _ in range(workers - 1):
+        t = threading.Thread(target=http_accept_loop, args=(s, www_root), daemon=True)
         t.start()
+    http_accept_loop(s, www_root)
 
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
-        s.bind((host, port))
-        s.listen(50)
+def http_server_async(host: str, port: int, www_root: str, udp_port: int | None = None,
+                      reuse_port: bool = False):
+    """
+    Mode async:
+    - 1 thread, 1 event loop asyncio (selector/epoll), tiap koneksi jadi 1 coroutine
+    - ga ada thread pool / queue, jadi ga ada stack thread per koneksi
+    - kalau udp_port dikasih, UDP echo juga jalan di event loop ini (lihat udp_echo_on_loop)
+    """
+    async def serve():
+        if udp_port is not None and not udp_echo_on_loop(asyncio.get_running_loop(), host, udp_port):
+            # Event loop tanpa add_reader (misal Proactor di Windows): balik ke thread sendiri
+            threading.Thread(target=udp_echo_server, args=(host, udp_port), daemon=True).start()
 
-        logging.info(f"[HTTP] Threaded server listening on {host}:{port} with {workers} workers (www={www_root})")
+        server = await asyncio.start_server(
+            lambda r, w: handle_http_client_async(r, w, www_root),
+            host, port,
+            reuse_address=True,
+            reuse_port=reuse_port,
+            backlog=LISTEN_BACKLOG,
+            limit=64 * 1024,
+        )
+        for sock in server.sockets:
+            enable_defer_accept(sock)
+        logging.info(f"[HTTP] Async server listening on {host}:{port} (www={www_root})")
+        async with server:
+            await server.serve_forever()
 
-        while True:
-            conn, addr = s.accept()
-            job_queue.put((conn, addr))
+    asyncio.run(serve())
 
 
 # =========================================================
 # Bagian C: UDP Echo server (untuk pengujian QoS/RTT)
 # =========================================================
 
+# Buffer socket UDP digedein (default kernel cuma ~208 KB) biar burst dari client ga ke-drop
+# sebelum sempat di-echo
+UDP_SOCKET_BUFFER = 2 * 1024 * 1024
+
+# Maksimal datagram yang di-echo per 1x wakeup event loop, biar banjir UDP ga bikin
+# koneksi HTTP di loop yang sama ga kebagian giliran
+UDP_ECHO_BATCH = 64
+
+
+def open_udp_echo_socket(host: str, port: int) -> socket.socket:
+    """
+    Bikin socket UDP echo (buffer digedein sebelum bind).
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_SOCKET_BUFFER)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, UDP_SOCKET_BUFFER)
+        s.bind((host, port))
+    except Exception:
+        s.close()
+        raise
+    logging.info(f"[UDP] Echo server listening on {host}:{port}")
+    return s
+
+
+def udp_echo_on_loop(loop: asyncio.AbstractEventLoop, host: str, port: int) -> bool:
+    """
+    UDP echo di event loop asyncio (mode async): socket non-blocking didaftarkan ke selector
+    loop pakai add_reader, jadi HTTP dan UDP dilayani 1 thread yang sama.
+    Tiap kali readable, datagram yang sudah antre di-echo sekaligus (maks UDP_ECHO_BATCH).
+    Return False kalau loop-nya ga support add_reader.
+    """
+    s = open_udp_echo_socket(host, port)
+    s.setblocking(False)
+    stats = thread_stats()
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    def on_readable():
+        for _ in range(UDP_ECHO_BATCH):
+            try:
+                data, addr = s.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                # Windows: ICMP port unreachable dari echo sebelumnya, abaikan
+                continue
+            try:
+                s.sendto(data, addr)
+            except (BlockingIOError, InterruptedError):
+                pass  # send buffer penuh: datagram di-drop, sama kayak UDP biasa
+            stats["udp_datagrams"] += 1
+            if debug:
+                logging.debug(f"[UDP] Received {len(data)} bytes from {addr}, echo back")
+
+    try:
+        loop.add_reader(s.fileno(), on_readable)
+    except NotImplementedError:
+        s.close()
+        return False
+    return True
+
+
 def udp_echo_server(host: str, port: int):
     """
     UDP Echo server:
     - terima datagram
     - kirim balik ke pengirim (echo)
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-        s.bind((host, port))
-        logging.info(f"[UDP] Echo server listening on {host}:{port}")
-
+    with open_udp_echo_socket(host, port) as s:
+        stats = thread_stats()
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         while True:
             data, addr = s.recvfrom(65535)
-            # Log singkat biar ga spam banget, tapi masih kebaca
-            logging.info(f"[UDP] Received {len(data)} bytes from {addr}, echo back")
             s.sendto(data, addr)
+            stats["udp_datagrams"] += 1
+            # Log per datagram cuma di --verbose (lebih mahal dari echo-nya sendiri),
+            # biasanya cukup ringkasan dari stats_reporter
+            if debug:
+                logging.debug(f"[UDP] Received {len(data)} bytes from {addr}, echo back")
 
 
 # =========================================================
 # Bagian D: main() + argumen CLI
 # =========================================================
 
+# index.html default kalau folder www belum ada isinya (konstanta bytes, ga dirakit tiap start)
+_DEFAULT_INDEX = (
+    b"<!DOCTYPE html>\n"
+    b"<html>\n"
+    b"<head><meta charset=\"UTF-8\" /><title>Final Project Jarkom</title></head>\n"
+    b"<body><h1>Web server jalan!</h1><p>Taruh file HTML kalian di folder www.</p></body>\n"
+    b"</html>\n"
+)
+
+
+def ensure_www_root(www_root: str):
+    """
+    Pastikan folder www ada, dan tulis index.html default kalau belum ada.
+    """
+    index = pathlib.Path(www_root) / "index.html"
+    index.parent.mkdir(parents=True, exist_ok=True)
+    if not index.exists():
+        index.write_bytes(_DEFAULT_INDEX)
+        logging.info(f"[HTTP] {index} belum ada, dibuat index.html default")
+
+
+def warm_response_cache(www_root: str):
+    """
+    Isi cache response dengan index.html sebelum server mulai (dan sebelum fork --processes,
+    jadi semua proses dapat cache-nya lewat copy-on-write). Request pertama langsung dari memori.
+    """
+    body_file = prepare_response(b"GET / HTTP/1.1\r\n\r\n", www_root)[5]
+    if body_file is not None:
+        body_file.close()  # index.html kegedean buat cache, nanti dikirim pakai sendfile
+
+
 def build_parser() -> argparse.ArgumentParser:
     """
     Parser CLI biar gampang run dan gampang ditulis di laporan.
     """
     parser = argparse.ArgumentParser(
-        description="Web Server (HTTP single/threaded) + UDP Echo server for Final Project"
+        description="Web Server (HTTP single/threaded/async, bisa multi-proses) + UDP Echo server for Final Project"
     )
-    parser.add_argument("--mode", choices=["single", "threaded"], default="single",
-                        help='Mode HTTP server. "single" untuk 1 koneksi per waktu, "threaded" untuk concurrent.')
+    parser.add_argument("--mode", choices=["single", "threaded", "async"], default="single",
+                        help='Mode HTTP server. "single" untuk 1 koneksi per waktu, "threaded" untuk concurrent '
+                             '(beberapa worker thread), "async" untuk concurrent pakai asyncio (1 thread).')
     parser.add_argument("--host", default="0.0.0.0", help="Bind address. Pakai 0.0.0.0 biar bisa diakses dari laptop lain.")
     parser.add_argument("--http-port", type=int, default=8000, help="Port HTTP server (TCP). Default 8000.")
     parser.add_argument("--udp-port", type=int, default=9000, help="Port UDP echo server. Default 9000.")
     parser.add_argument("--www", default="www", help="Folder root untuk file web (default: www).")
     parser.add_argument("--workers", type=int, default=5, help="Jumlah worker thread saat mode threaded.")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Jumlah proses HTTP server (butuh SO_REUSEPORT yang load-balance, Linux). "
+                             "Default 1. Pakai os.cpu_count() biar semua core kepakai.")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log detail tiap request HTTP / datagram UDP (level DEBUG). "
+                             "Default cuma ringkasan tiap 5 detik.")
 
     return parser
 
@@ -310,22 +963,76 @@ def print_quick_commands():
     logging.info("===== QUICK COMMANDS (Laptop A) =====")
     logging.info('HTTP single   : python web_server.py --mode single --host 0.0.0.0 --http-port 8000 --www www')
     logging.info('HTTP threaded : python web_server.py --mode threaded --host 0.0.0.0 --http-port 8000 --www www --workers 5')
+    logging.info('HTTP async    : python web_server.py --mode async --host 0.0.0.0 --http-port 8000 --www www')
+    logging.info('Multi-proses  : tambah --processes 4 (Linux, SO_REUSEPORT), misal --mode async --processes 4')
     logging.info('UDP echo port : default 9000 (jalan otomatis bareng HTTP)')
     logging.info("=====================================")
 
 
+def run_http_server(mode: str, host: str, port: int, www_root: str, workers: int, udp_port: int | None = None,
+                    reuse_port: bool = False):
+    """
+    Jalankan HTTP server sesuai mode. Dipakai proses utama dan proses tambahan (--processes).
+    udp_port cuma dipakai mode async (UDP echo ikut di event loop-nya).
+    reuse_port: set SO_REUSEPORT di socket listen, cuma kalau --processes > 1.
+    """
+    # Ringkasan statistik berkala (ganti log per request), counter-nya per proses
+    threading.Thread(target=stats_reporter, daemon=True).start()
+
+    if mode == "single":
+        http_server_single(host, port, www_root, reuse_port)
+    elif mode == "async":
+        http_server_async(host, port, www_root, udp_port, reuse_port)
+    else:
+        http_server_threaded(host, port, www_root, workers=workers, reuse_port=reuse_port)
+
+
 def main():
     parser = build_parser()
     args = parser.parse_args()
 
-    # Pastikan folder www ada
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    # Pastikan folder www (dan index.html) ada, lalu panasin cache-nya
     www_root = args.www
-    os.makedirs(www_root, exist_ok=True)
+    ensure_www_root(www_root)
+    warm_response_cache(www_root)
 
     # Info singkat command yang sering dipakai
     print_quick_commands()
 
-    # UDP echo server jalan di thread sendiri supaya barengan sama HTTP
+    processes = args.processes
+    if processes > 1 and not REUSEPORT_BALANCED:
+        logging.warning("[HTTP] SO_REUSEPORT (load-balance) tidak tersedia di OS ini, HTTP server jalan 1 proses saja")
+        processes = 1
+
+    # Proses tambahan masing-masing buka socket listen SO_REUSEPORT sendiri di port yang sama,
+    # jadi ga rebutan GIL. UDP echo tetap 1 di proses utama.
+    # Dijalankan sebelum thread apa pun dibuat, biar fork-nya aman. Start method sengaja "fork"
+    # (bukan default, yang mulai Python 3.14 jadi forkserver di Linux) biar level logging
+    # (--verbose) dan cache yang sudah dipanasin ikut kebawa ke proses anak.
+    # Context "fork" cuma diambil di sini (cabang ini cuma jalan di Linux), Windows ga punya fork.
+    reuse_port = processes > 1
+    if processes > 1:
+        mp = multiprocessing.get_context("fork")
+        for _ in range(processes - 1):
+            mp.Process(
+                target=run_http_server,
+                args=(args.mode, args.host, args.http_port, www_root, args.workers, None, reuse_port),
+                daemon=True
+            ).start()
+        # SIGTERM ke proses utama -> exit normal, jadi proses daemon di atas ikut dimatikan
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        logging.info(f"[HTTP] Jalan di {processes} proses")
+
+    # Jalankan HTTP sesuai mode. Mode async: UDP echo ikut di event loop proses utama.
+    # Mode lain: UDP echo server jalan di thread sendiri supaya barengan sama HTTP
+    if args.mode == "async":
+        run_http_server(args.mode, args.host, args.http_port, www_root, args.workers,
+                        udp_port=args.udp_port, reuse_port=reuse_port)
+        return
+
     udp_thread = threading.Thread(
         target=udp_echo_server,
         args=(args.host, args.udp_port),
@@ -333,11 +1040,7 @@ def main():
     )
     udp_thread.start()
 
-    # Jalankan HTTP sesuai mode
-    if args.mode == "single":
-        http_server_single(args.host, args.http_port, www_root)
-    else:
-        http_server_threaded(args.host, args.http_port, www_root, workers=args.workers)
+    run_http_server(args.mode, args.host, args.http_port, www_root, args.workers, reuse_port=reuse_port)
 
 
 if __name__ == "__main__":